@@ -12,15 +12,8 @@ from simple_model import SimpleModel
 app = InferenceAPI(model_type=E5LargeModel)
 # app = InferenceAPI(model_type=SimpleModel)
 
-@app.post("/passage", tags=OPENAPI_TAGS_MODEL)
-async def predict(data: List[str]) -> List[List[float]]:
-    result = await app.submit_tasks(E5LargeModel.passage, data)
-    return result
-
-@app.post("/query", tags=OPENAPI_TAGS_MODEL)
-async def predict(data: List[str]) -> List[List[float]]:
-    result = await app.submit_tasks(E5LargeModel.query, data)
-    return result
+app.add_task_route("/passage", E5LargeModel.passage, tags=OPENAPI_TAGS_MODEL)
+app.add_task_route("/query", E5LargeModel.query, tags=OPENAPI_TAGS_MODEL)
 
 @app.post("/batch", tags=OPENAPI_TAGS_MODEL)
 async def predict(data: List[str]) -> List[List[float]]:
@@ -20,11 +20,14 @@ class E5LargeModel(InferenceModel):
         self.logger.info("Model initiated on %s", self.model.device)
 
     @InferenceModel.task()
-    def passage(self, texts: List[str]):
-        embeddings = self.model.encode(texts, prompt="passage: ", normalize_embeddings=True)
+    def encode(self, texts: List[str]):
+        embeddings = self.model.encode(texts, normalize_embeddings=True)
         return embeddings
+
+    @InferenceModel.task(group="encode", transform=lambda text: "passage: " + text)
+    def passage(self, texts: List[str]):
+        ... # Fused tasks run through their group task 'encode'
     
-    @InferenceModel.task()
+    @InferenceModel.task(group="encode", transform=lambda text: "query: " + text)
     def query(self, texts: List[str]):
-        embeddings = self.model.encode(texts, prompt="query: ", normalize_embeddings=True)
-        return embeddings
\ No newline at end of file
+        ... # Fused tasks run through their group task 'encode'
\ No newline at end of file
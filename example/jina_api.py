@@ -13,10 +13,7 @@ from jina_clip import JinaClip
 
 app = InferenceAPI(model_type=JinaClip)
 
-@app.post("/texts", tags=OPENAPI_TAGS_MODEL)
-async def predict(data: List[str]) -> List[List[float]]:
-    result = await app.submit_tasks(JinaClip.texts, data)
-    return result
+app.add_task_route("/texts", JinaClip.texts, tags=OPENAPI_TAGS_MODEL)
 
 @app.post("/images", tags=OPENAPI_TAGS_MODEL)
 async def predict(data: List[UploadFile]) -> List[List[float]]:
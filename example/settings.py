@@ -1,7 +1,9 @@
 import sys, os
 sys.path.append(os.path.abspath(".."))
 
+from dataclasses import dataclass
 from lib.settings import BaseSettings
 
+@dataclass
 class ModelSettings(BaseSettings):
-    MAX_BATCH_SIZE: 44
\ No newline at end of file
+    MAX_BATCH_SIZE: int = 44
\ No newline at end of file
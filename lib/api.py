@@ -1,21 +1,25 @@
 # First-party
 from pathlib import Path
 import logging
-from typing import Callable, Any, Tuple, Type, List, Dict, Iterable
+from typing import Callable, Any, Tuple, Type, List, Dict, Iterable, get_origin, get_args
 from contextlib import asynccontextmanager
 from time import perf_counter
+import json
 
 # Third-party
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import RedirectResponse, JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.routing import Route
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
 from prometheus_fastapi_instrumentator import Instrumentator
 from prometheus_client import Histogram, Gauge
 # Own
 from .model import InferenceModel
 from .scheduler import Scheduler
+from .recorder import TrafficRecorder
 from lib.model import InferenceModel, ModelError
 from lib.api_models import HealthCheckModel
 from lib.settings import SettingsLoader, BaseSettings
@@ -39,23 +43,126 @@ HEALTH_ENDPOINT_DESCRIPTION = """
 ## Description
 Endpoint for checking if worker pool and API is up.
 """
-class RequestDurationMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint):
+
+# Use orjson for the task routes if installed, as it is considerably faster for large float lists
+try:
+    import orjson
+    def json_loads(body: bytes) -> Any:
+        return orjson.loads(body)
+    def json_dumps(content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:
+    def json_loads(body: bytes) -> Any:
+        return json.loads(body)
+    def json_dumps(content: Any) -> bytes:
+        return json.dumps(content, separators=(",", ":"), default=lambda x: x.tolist()).encode("utf-8")
+
+# Pure ASGI middleware, as BaseHTTPMiddleware adds a task and response streaming per request
+class RequestDurationMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
         # Start timer
         start_time = perf_counter()
 
+        async def send_with_duration(message: Message):
+            # Measure and set header when the response starts
+            if message["type"] == "http.response.start":
+                process_time = perf_counter() - start_time
+                message.setdefault("headers", [])
+                MutableHeaders(scope=message).append("X-Request-Duration", f"{process_time:.6f}")
+            await send(message)
+
         # Do actual call
-        response = await call_next(request) 
+        await self.app(scope, receive, send_with_duration)
+
+def json_validator(type_: Any) -> Callable[[Any], bool]:
+    # Builds a check of a decoded JSON value against 'type_'. Only JSON scalars and (nested) lists of them are supported
+    if type_ is Any:
+        return lambda x: True
+    if get_origin(type_) is list:
+        args = get_args(type_)
+        element_validator = json_validator(args[0]) if args else (lambda x: True)
+        return lambda x: isinstance(x, list) and all(element_validator(y) for y in x)
+    if type_ is float:
+        return lambda x: isinstance(x, (int, float)) and not isinstance(x, bool)
+    if type_ is int:
+        return lambda x: isinstance(x, int) and not isinstance(x, bool)
+    if type_ in (str, bool):
+        return lambda x: isinstance(x, type_)
+    raise Exception(f"Task routes only support JSON scalars and lists of them as request type, got '{type_}'")
+
+def validation_error(error_type: str, loc: List[Any], msg: str, input: Any) -> Dict[str, Any]:
+    # Same shape as FastAPI's HTTPValidationError, so the documented 422 response holds
+    return {"detail": [{"type": error_type, "loc": loc, "msg": msg, "input": input}]}
+
+class TaskEndpoint:
+    """
+    Raw ASGI endpoint that parses the JSON body and hands it directly to the scheduler, skipping FastAPI validation.
+    Each element is checked against the request type with plain isinstance checks, so a malformed request is rejected before it can fail a shared batch.
+    Responses are not validated.
+    """
+
+    def __init__(self, api: "InferenceAPI", task_name: str, request_type: Any):
+        self.api = api
+        self.task_name = task_name
+        self.is_list = get_origin(request_type) is list
+        element_type = (get_args(request_type) or (Any,))[0] if self.is_list else request_type
+        self.element_validator = json_validator(element_type)
+        self.element_type_name = str(element_type).replace("typing.", "") if get_origin(element_type) else element_type.__name__
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        # Read full body
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
 
-        # Measure and set header
-        process_time = perf_counter() - start_time
-        response.headers["X-Request-Duration"] = f"{process_time:.6f}"
+        try:
+            data = json_loads(b"".join(chunks))
+        except ValueError:
+            await self.respond(send, 422, validation_error("json_invalid", ["body"], "JSON decode error", {}))
+            return
+        if self.is_list and not isinstance(data, list):
+            await self.respond(send, 422, validation_error("list_type", ["body"], "Input should be a valid list", data))
+            return
+        elements = data if self.is_list else [data]
+        for (i, element) in enumerate(elements):
+            if not self.element_validator(element):
+                loc = ["body", i] if self.is_list else ["body"]
+                await self.respond(send, 422, validation_error("type_error", loc, f"Input should be of type '{self.element_type_name}'", element))
+                return
 
-        return response
+        try:
+            result = await self.api._submit(self.task_name, elements)
+        except ModelError as exc:
+            await self.respond(send, exc.http_status_code, exc.message)
+            return
+
+        await self.respond(send, 200, result if self.is_list else result[0])
+
+    async def respond(self, send: Send, status: int, content: Any):
+        body = json_dumps(content)
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
 
 class InferenceAPI(FastAPI):
     _scheduler: Scheduler
+    _recorder: TrafficRecorder | None = None
     logger: logging.Logger
     settings: BaseSettings
 
@@ -104,6 +211,11 @@ class InferenceAPI(FastAPI):
         # Load the ML model
         await self._scheduler.start()
 
+        # Start recording traffic if enabled
+        if self.settings.RECORD_TRAFFIC_PATH:
+            self._recorder = TrafficRecorder(self.settings.RECORD_TRAFFIC_PATH)
+            self.logger.info("Recording traffic to '%s'", self.settings.RECORD_TRAFFIC_PATH)
+
         # Setup Prometheus
         for instrumentation in self._scheduler.metrics.get_instrumentations():
             self.instrumentator.add(instrumentation)
@@ -118,6 +230,8 @@ class InferenceAPI(FastAPI):
 
         # Clean up the ML model and release the resources
         self._scheduler.stop()
+        if self._recorder is not None:
+            self._recorder.close()
 
     async def health(self) -> HealthCheckModel:
         if self.pool == None:
@@ -141,10 +255,34 @@ class InferenceAPI(FastAPI):
 
     async def submit_task(self, task_signature, data: Any):
         task_key = InferenceModel.get_task_key(task_signature)
-        result = await self._scheduler.submit_tasks(task_name=task_key.task_name, data=[data])
+        result = await self._submit(task_key.task_name, [data])
         return result[0]
 
     async def submit_tasks(self, task_signature, data: Iterable[Any]):
         task_key = InferenceModel.get_task_key(task_signature)
-        result = await self._scheduler.submit_tasks(task_name=task_key.task_name, data=data)
-        return result
\ No newline at end of file
+        result = await self._submit(task_key.task_name, list(data))
+        return result
+
+    async def _submit(self, task_name: str, data: List[Any]):
+        if self._recorder is not None:
+            self._recorder.record(task_name, len(data))
+        return await self._scheduler.submit_tasks(task_name=task_name, data=data)
+
+    def add_task_route(self, path: str, task_signature, request_type: Any = List[str], response_type: Any = List[List[float]], **kwargs):
+        """
+        Adds a POST route for a task served by a lean ASGI endpoint without FastAPI request/response validation.
+        The body is a JSON array if 'request_type' is a list, otherwise a single element.
+        'request_type' must be a JSON scalar (str, int, float, bool) or a list of them.
+        A documentation-only FastAPI route with the same types is registered behind it, so the OpenAPI docs stay accurate.
+        """
+        task_key = InferenceModel.get_task_key(task_signature)
+        task_endpoint = TaskEndpoint(self, task_key.task_name, request_type)
+
+        # Matched first, so it handles all requests to the path
+        self.router.routes.append(Route(path, task_endpoint, methods=["POST"]))
+
+        # Documentation only, never run as the task endpoint above shadows it
+        async def endpoint(data: request_type) -> response_type:
+            ...
+        endpoint.__name__ = task_key.task_name
+        self.add_api_route(path, endpoint, methods=["POST"], **kwargs)
\ No newline at end of file
@@ -10,6 +10,11 @@ class TaskKey:
     model_name: str
     task_name: str
 
+@dataclass(frozen=True)
+class TaskFusion:
+    group: str # Name of the task in the same model that runs the shared model call
+    transform: Callable[[Any], Any] # Applied to each element before it is passed to the group task
+
 class ModelError(Exception):
     message: str 
     http_status_code: int
@@ -20,6 +25,7 @@ class ModelError(Exception):
 
 class InferenceModel:
     _task_registry: Dict[TaskKey, Callable] = {}
+    _task_fusions: Dict[TaskKey, TaskFusion] = {}
 
     model_metrics_timing_buckets = [50, 100, 500, 1000, 5000, 10000]
 
@@ -39,6 +45,14 @@ class InferenceModel:
         task_key = TaskKey(self.__class__.__name__, task_name)
         handler = self._task_registry.get(task_key, self._default_handler)
         return handler(self, data)
+
+    def run_fused_task(self, group: str, task_names: List[str], data: List[Any]):
+        # Transform each element according to its own task and run them together as one batch of the group task
+        fused_data = []
+        for (task_name, element) in zip(task_names, data):
+            fusion = self._task_fusions.get(TaskKey(self.__class__.__name__, task_name))
+            fused_data.append(element if fusion is None else fusion.transform(element))
+        return self.run_task(group, fused_data)
             
     def _default_handler(self, data):
         return data
@@ -46,6 +60,23 @@ class InferenceModel:
     @classmethod
     def get_task_names(cls) -> List[str]:
         return [x.task_name for x in cls._task_registry if x.model_name == cls.__name__]
+
+    @classmethod
+    def get_task_groups(cls) -> Dict[str, str]:
+        # Maps each task name to the task that its elements are batched and run with
+        task_names = cls.get_task_names()
+        task_groups = {}
+        for task_name in task_names:
+            fusion = cls._task_fusions.get(TaskKey(cls.__name__, task_name))
+            if fusion is None:
+                task_groups[task_name] = task_name
+                continue
+            if fusion.group not in task_names:
+                raise Exception(f"Task '{task_name}' is fused with unknown task '{fusion.group}' in model '{cls.__name__}'")
+            if TaskKey(cls.__name__, fusion.group) in cls._task_fusions:
+                raise Exception(f"Task '{task_name}' is fused with task '{fusion.group}' which is itself fused")
+            task_groups[task_name] = fusion.group
+        return task_groups
     
     @classmethod
     def get_task_key(cls, func: Callable) -> TaskKey:
@@ -55,13 +86,19 @@ class InferenceModel:
         return TaskKey(model_name, task_name)
 
     @classmethod
-    def task(cls):
+    def task(cls, group: Optional[str] = None, transform: Optional[Callable[[Any], Any]] = None):
         # This decorator will store the task_name and function to be registered later
+        # Tasks with a 'group' are batched together with the group task and run through it after applying 'transform' per element
+        # The body of a fused task is never run by the Scheduler
         def decorator(func: Callable):
             task_key = cls.get_task_key(func)
 
             if task_key in cls._task_registry:
                 raise Exception("Duplicate task types defined across InferenceModel classes. Please define unique task types")
             cls._task_registry[task_key] = func
+            if group is not None:
+                cls._task_fusions[task_key] = TaskFusion(group, transform or (lambda x: x))
+            elif transform is not None:
+                raise Exception("A task transform requires a group to fuse with")
             return func
         return decorator
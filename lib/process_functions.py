@@ -1,6 +1,6 @@
 from time import perf_counter
 import logging
-from typing import List, Any
+from typing import List, Any, Optional
 from dataclasses import dataclass
 
 from .model import InferenceModel
@@ -22,12 +22,15 @@ def worker_create_model(model_type):
     model = model_type()
  
  
-def worker_model_predict(task_name: str, data: List[Any]) -> TaskResult:
+def worker_model_predict(task_name: str, data: List[Any], task_names: Optional[List[str]] = None) -> TaskResult:
     start_time = perf_counter()
     result = None
     error = None
     try:
-        result = model.run_task(task_name, data) 
+        if task_names is None:
+            result = model.run_task(task_name, data)
+        else:
+            result = model.run_fused_task(task_name, task_names, data)
     except ModelError as me:
         logging.getLogger('uvicorn.error').error("Model Error: %s", me.message)
         error = me
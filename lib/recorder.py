@@ -0,0 +1,35 @@
+from typing import List, TextIO
+from dataclasses import dataclass
+from time import time
+
+@dataclass
+class TrafficRecord:
+    timestamp: float # Arrival time in seconds
+    task_name: str
+    size: int # Number of elements in the request
+
+class TrafficRecorder:
+    """Appends one tab-separated line per request: '<timestamp>\\t<task_name>\\t<size>'"""
+    file: TextIO
+
+    def __init__(self, path: str):
+        # Line buffered, so records survive the process being killed
+        self.file = open(path, "a", encoding="utf-8", buffering=1)
+
+    def record(self, task_name: str, size: int):
+        self.file.write(f"{time():.6f}\t{task_name}\t{size}\n")
+
+    def close(self):
+        self.file.close()
+
+    @staticmethod
+    def load(path: str) -> List[TrafficRecord]:
+        records = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                timestamp, task_name, size = line.rstrip("\n").split("\t")
+                records.append(TrafficRecord(float(timestamp), task_name, int(size)))
+        records.sort(key=lambda x: x.timestamp)
+        return records
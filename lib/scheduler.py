@@ -14,6 +14,7 @@ from .metrics import Metrics
 class TaskElement:
     future: asyncio.Future
     data: Any
+    task_name: str
 
 @dataclass
 class TaskBatch:
@@ -35,6 +36,9 @@ class Scheduler:
         # Initiate metrics
         self.metrics = Metrics(self.model_type)
 
+        # Tasks fused into a group share the queue of the group task
+        self.task_groups = self.model_type.get_task_groups()
+
         # Queue for the individual task elements before being batch grouped
         self.task_queues: Dict[str, asyncio.Queue[TaskElement]]  = {}
         # Queue for the batches of elements already batched up
@@ -42,7 +46,7 @@ class Scheduler:
 
         # Create queues for each task type and startk worker,
         loop = asyncio.get_running_loop()
-        for task_name in self.model_type.get_task_names():
+        for task_name in dict.fromkeys(self.task_groups.values()):
             loop.create_task(self.task_batcher_worker(task_name))
             self.task_queues[task_name] = asyncio.Queue()
             # Update metrics
@@ -60,12 +64,12 @@ class Scheduler:
 
 
     async def submit_tasks(self, task_name: str, data: List[Any]):
-        queue = self.task_queues[task_name]
+        queue = self.task_queues[self.task_groups[task_name]]
         loop = asyncio.get_running_loop()
         futures = [loop.create_future() for _ in data]
 
         for (future, element) in zip(futures, data):
-            batch_element = TaskElement(future, element)
+            batch_element = TaskElement(future, element, task_name)
             await queue.put(batch_element)
 
         await asyncio.gather(*futures)
@@ -115,10 +119,14 @@ class Scheduler:
             # Split the task batch elements into native list
             futures = list(map(lambda x: x.future, task_batch.buffer))
             data = list(map(lambda x: x.data, task_batch.buffer))
+            # Only send element task names when the batch contains fused tasks
+            task_names = list(map(lambda x: x.task_name, task_batch.buffer))
+            if all(x == task_batch.task_name for x in task_names):
+                task_names = None
 
             # Run the model with list of data
             loop = asyncio.get_running_loop()
-            task_result = await loop.run_in_executor(self.pool, worker_model_predict, task_batch.task_name, data)
+            task_result = await loop.run_in_executor(self.pool, worker_model_predict, task_batch.task_name, data, task_names)
 
             # Handle error and do logging
             inference_log = f"Batch size: {len(data)} | {task_result.inference_time}ms | Task: {task_batch.task_name}" 
@@ -12,9 +12,10 @@ class BaseSettings:
     POOL_WORKERS: int = 1
     USE_GPU: bool = True
     WARMUP: bool = True
-    MAX_BATCH_SIZE = 32 # Max size of batch
-    MAX_BATCH_WAIT_TIME = 0.05 # Max milliseconds to wait for filling up a batch 
-    FILL_QUEUE_SIZE_THRESHOLD = 3 # Set queue size threshold for ignoring MAX_BATCH_WAIT_TIME
+    MAX_BATCH_SIZE: int = 32 # Max size of batch
+    MAX_BATCH_WAIT_TIME: float = 0.05 # Max milliseconds to wait for filling up a batch 
+    FILL_QUEUE_SIZE_THRESHOLD: int = 3 # Set queue size threshold for ignoring MAX_BATCH_WAIT_TIME
+    RECORD_TRAFFIC_PATH: str = "" # File to record incoming task traffic to for replay in the simulator. Empty disables recording
 
 class SettingsLoader:
 
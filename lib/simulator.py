@@ -0,0 +1,231 @@
+# Replays recorded traffic through a discrete-event model of the Scheduler batching.
+# Run with 'python -m lib.simulator traffic.tsv costs.json --max-batch-size 8 16 32 --pool-workers 1 2'
+import argparse
+import heapq
+import itertools
+import json
+import math
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass, field, replace
+from typing import List, Dict, Tuple, Deque
+
+from .settings import BaseSettings
+from .recorder import TrafficRecorder, TrafficRecord
+
+class CostCurve:
+    """Batch latency in milliseconds from measured (batch_size, latency_ms) points, linearly interpolated"""
+    sizes: List[int]
+    latencies: List[float]
+
+    def __init__(self, points: List[Tuple[int, float]]):
+        if len(points) == 0:
+            raise ValueError("Cost curve needs at least one measured point")
+        points = sorted(points)
+        self.sizes = [int(size) for size, _ in points]
+        self.latencies = [float(latency) for _, latency in points]
+
+    def latency(self, batch_size: int) -> float:
+        if len(self.sizes) == 1:
+            return self.latencies[0]
+        # Extrapolate linearly from the nearest segment outside the measured range
+        i = min(max(bisect_left(self.sizes, batch_size), 1), len(self.sizes) - 1)
+        (x0, x1), (y0, y1) = self.sizes[i-1:i+1], self.latencies[i-1:i+1]
+        return max(0.0, y0 + (y1 - y0) * (batch_size - x0) / (x1 - x0))
+
+    @staticmethod
+    def load(path: str) -> Dict[str, "CostCurve"]:
+        # JSON file mapping task name to a list of [batch_size, latency_ms] points
+        with open(path, encoding="utf-8") as f:
+            return {task_name: CostCurve(points) for task_name, points in json.load(f).items()}
+
+@dataclass
+class SimulationResult:
+    settings: BaseSettings
+    requests: int
+    elements: int
+    batches: int
+    duration: float # Seconds from first arrival to last completion
+    latencies: List[float] # Request latencies in milliseconds, sorted
+
+    @property
+    def throughput(self) -> float:
+        return self.elements / self.duration if self.duration > 0 else 0.0
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.elements / self.batches if self.batches > 0 else 0.0
+
+    def percentile(self, p: float) -> float:
+        if len(self.latencies) == 0:
+            return 0.0
+        index = max(0, math.ceil(p / 100 * len(self.latencies)) - 1)
+        return self.latencies[index]
+
+@dataclass
+class _Request:
+    arrival: float
+    remaining: int
+    completed: float = 0.0
+
+@dataclass
+class _TaskState:
+    pending: Deque[_Request] = field(default_factory=deque) # Elements not yet picked up by the batcher
+    buffer: List[_Request] = field(default_factory=list)
+    window_end: float | None = None # None when idle
+    idle_since: float = 0.0
+    generation: int = 0 # Invalidates scheduled window ends when a window closes early
+
+class Simulator:
+    """
+    Mirrors 'Scheduler.task_batcher_worker' and 'Scheduler.batch_queue_worker' with simulated time.
+    Each task batcher fills a buffer within windows of MAX_BATCH_WAIT_TIME, closing early when MAX_BATCH_SIZE is reached.
+    Batches are held back while the batch queue exceeds FILL_QUEUE_SIZE_THRESHOLD, and POOL_WORKERS run batches in order.
+    Tasks fused into a group through 'task_groups' share the batcher and cost curve of the group task.
+    """
+    _ARRIVAL, _WINDOW_END, _WORKER_DONE = range(3)
+
+    def __init__(self, cost_curves: Dict[str, CostCurve], settings: BaseSettings, task_groups: Dict[str, str] = {}):
+        self.cost_curves = cost_curves
+        self.settings = settings
+        self.task_groups = task_groups
+
+    def run(self, traffic: List[TrafficRecord], time_scale: float = 1.0) -> SimulationResult:
+        wait_time = self.settings.MAX_BATCH_WAIT_TIME / 1000.0
+        max_batch_size = self.settings.MAX_BATCH_SIZE
+        events: List[Tuple[float, int, int, Tuple]] = []
+        sequence = itertools.count() # Keeps ordering of simultaneous events deterministic
+        def schedule(time: float, kind: int, *args):
+            heapq.heappush(events, (time, next(sequence), kind, args))
+
+        start = traffic[0].timestamp if traffic else 0.0
+        requests = []
+        for record in traffic:
+            task_name = self.task_groups.get(record.task_name, record.task_name)
+            if task_name not in self.cost_curves:
+                raise ValueError(f"No cost curve for task '{task_name}'")
+            if record.size <= 0:
+                continue
+            request = _Request(arrival=(record.timestamp - start) * time_scale, remaining=record.size)
+            requests.append(request)
+            schedule(request.arrival, self._ARRIVAL, task_name, request, record.size)
+
+        tasks = {task_name: _TaskState() for task_name in self.cost_curves}
+        batch_queue: Deque[Tuple[str, List[_Request]]] = deque()
+        idle_workers = self.settings.POOL_WORKERS
+        batches = 0
+        now = 0.0
+
+        def open_window(task_name: str, state: _TaskState):
+            # Start a new window, taking already queued elements first like the real batcher does
+            state.generation += 1
+            while state.pending and len(state.buffer) < max_batch_size:
+                state.buffer.append(state.pending.popleft())
+            if len(state.buffer) >= max_batch_size:
+                state.window_end = now
+                schedule(now, self._WINDOW_END, task_name, state.generation)
+            elif state.buffer and wait_time == 0:
+                # A held back buffer would otherwise be re-checked forever at the same time, so wait for the next worker or arrival
+                state.window_end = None
+            elif state.buffer or state.pending:
+                state.window_end = now + wait_time
+                schedule(state.window_end, self._WINDOW_END, task_name, state.generation)
+            else:
+                state.window_end = None
+                state.idle_since = now
+
+        def start_workers():
+            nonlocal idle_workers
+            while idle_workers > 0 and batch_queue:
+                task_name, buffer = batch_queue.popleft()
+                idle_workers -= 1
+                latency = self.cost_curves[task_name].latency(len(buffer)) / 1000.0
+                schedule(now + latency, self._WORKER_DONE, buffer)
+
+        while events:
+            now, _, kind, args = heapq.heappop(events)
+
+            if kind == self._ARRIVAL:
+                task_name, request, size = args
+                state = tasks[task_name]
+                state.pending.extend([request] * size)
+                if state.window_end is None:
+                    # The idle batcher keeps cycling windows, so the element waits for the current one to end
+                    if wait_time > 0:
+                        state.window_end = state.idle_since + (math.floor((now - state.idle_since) / wait_time) + 1) * wait_time
+                    else:
+                        state.window_end = now
+                    state.generation += 1
+                    schedule(state.window_end, self._WINDOW_END, task_name, state.generation)
+                while state.pending and len(state.buffer) < max_batch_size:
+                    state.buffer.append(state.pending.popleft())
+                if len(state.buffer) >= max_batch_size and state.window_end > now:
+                    state.window_end = now
+                    state.generation += 1
+                    schedule(now, self._WINDOW_END, task_name, state.generation)
+
+            elif kind == self._WINDOW_END:
+                task_name, generation = args
+                state = tasks[task_name]
+                if generation != state.generation:
+                    continue
+                if len(state.buffer) > 0 and not (len(batch_queue) > self.settings.FILL_QUEUE_SIZE_THRESHOLD
+                                                  and len(state.buffer) < max_batch_size):
+                    batch_queue.append((task_name, state.buffer))
+                    state.buffer = []
+                    batches += 1
+                    start_workers()
+                open_window(task_name, state)
+
+            elif kind == self._WORKER_DONE:
+                (buffer,) = args
+                for request in buffer:
+                    request.remaining -= 1
+                    if request.remaining == 0:
+                        request.completed = now
+                idle_workers += 1
+                start_workers()
+                # Re-check buffers held back without a window
+                for task_name, state in tasks.items():
+                    if state.window_end is None and state.buffer:
+                        state.window_end = now
+                        state.generation += 1
+                        schedule(now, self._WINDOW_END, task_name, state.generation)
+
+        return SimulationResult(
+            settings=self.settings,
+            requests=len(requests),
+            elements=sum(record.size for record in traffic if record.size > 0),
+            batches=batches,
+            duration=now,
+            latencies=sorted((r.completed - r.arrival) * 1000 for r in requests)
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded traffic against alternative Scheduler settings")
+    parser.add_argument("traffic", help="File recorded with INFERENCE_RECORD_TRAFFIC_PATH")
+    parser.add_argument("costs", help="JSON file mapping task name to [batch_size, latency_ms] points")
+    parser.add_argument("--max-batch-size", type=int, nargs="+", default=[BaseSettings.MAX_BATCH_SIZE])
+    parser.add_argument("--max-batch-wait-time", type=float, nargs="+", default=[BaseSettings.MAX_BATCH_WAIT_TIME])
+    parser.add_argument("--fill-queue-size-threshold", type=int, nargs="+", default=[BaseSettings.FILL_QUEUE_SIZE_THRESHOLD])
+    parser.add_argument("--pool-workers", type=int, nargs="+", default=[BaseSettings.POOL_WORKERS])
+    parser.add_argument("--task-group", nargs="*", default=[], metavar="TASK=GROUP", help="Simulate TASK fused into the batches of GROUP")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Multiplier on inter-arrival times, below 1 increases load")
+    args = parser.parse_args()
+    if any(wait < 0 for wait in args.max_batch_wait_time):
+        parser.error("--max-batch-wait-time must not be negative")
+    if any(len(x.split("=")) != 2 or "" in x.split("=") for x in args.task_group):
+        parser.error("--task-group values must be of the form TASK=GROUP")
+
+    traffic = TrafficRecorder.load(args.traffic)
+    cost_curves = CostCurve.load(args.costs)
+    task_groups = dict(x.split("=") for x in args.task_group)
+
+    print(f"{'workers':>7} {'size':>5} {'wait_ms':>8} {'fill':>4} | {'batches':>7} {'mean_bs':>7} {'elem/s':>9} {'p50_ms':>9} {'p90_ms':>9} {'p99_ms':>9}")
+    for workers, size, wait, fill in itertools.product(args.pool_workers, args.max_batch_size, args.max_batch_wait_time, args.fill_queue_size_threshold):
+        settings = replace(BaseSettings(), POOL_WORKERS=workers, MAX_BATCH_SIZE=size, MAX_BATCH_WAIT_TIME=wait, FILL_QUEUE_SIZE_THRESHOLD=fill)
+        r = Simulator(cost_curves, settings, task_groups).run(traffic, time_scale=args.time_scale)
+        print(f"{workers:>7} {size:>5} {wait:>8g} {fill:>4} | {r.batches:>7} {r.mean_batch_size:>7.1f} {r.throughput:>9.1f} {r.percentile(50):>9.1f} {r.percentile(90):>9.1f} {r.percentile(99):>9.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+import asyncio
+from typing import List
+
+import httpx
+import pytest
+from fastapi import UploadFile
+from pydantic import BaseModel
+
+from lib.api import InferenceAPI, RequestDurationMiddleware
+from lib.model import InferenceModel, ModelError
+
+class ApiModel(InferenceModel):
+    @InferenceModel.task()
+    def lengths(self, texts):
+        return [[float(len(text))] for text in texts]
+
+    @InferenceModel.task()
+    def length(self, texts):
+        return [len(text) for text in texts]
+
+    @InferenceModel.task()
+    def sums(self, vectors):
+        return [sum(vector) for vector in vectors]
+
+    @InferenceModel.task()
+    def fail(self, texts):
+        raise ModelError("Model hiccup", http_status_code=418)
+
+class Item(BaseModel):
+    text: str
+
+@pytest.fixture(scope="module")
+def client():
+    # The scheduler binds to the event loop it is created in, so every request runs on the same loop
+    loop = asyncio.new_event_loop()
+
+    async def create():
+        app = InferenceAPI(model_type=ApiModel)
+        app.add_task_route("/lengths", ApiModel.lengths)
+        app.add_task_route("/length", ApiModel.length, request_type=str, response_type=int)
+        app.add_task_route("/sums", ApiModel.sums, request_type=List[List[float]], response_type=List[float])
+        app.add_task_route("/fail", ApiModel.fail)
+        return app
+
+    app = loop.run_until_complete(create())
+    lifespan = app.router.lifespan_context(app)
+    loop.run_until_complete(lifespan.__aenter__())
+    http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+    def request(method, path, **kwargs):
+        return loop.run_until_complete(http_client.request(method, path, **kwargs))
+    request.app = app
+    request.loop = loop
+    request.http_client = http_client
+    yield request
+
+    loop.run_until_complete(http_client.aclose())
+    loop.run_until_complete(lifespan.__aexit__(None, None, None))
+    # Stop the scheduler workers before closing the loop
+    tasks = asyncio.all_tasks(loop)
+    for task in tasks:
+        task.cancel()
+    loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+    loop.close()
+
+def test_list_request(client):
+    r = client("POST", "/lengths", json=["ab", "c"])
+    assert r.status_code == 200
+    assert r.json() == [[2.0], [1.0]]
+
+def test_single_request(client):
+    r = client("POST", "/length", json="abc")
+    assert r.status_code == 200
+    assert r.json() == 3
+
+def test_nested_request(client):
+    r = client("POST", "/sums", json=[[1, 2.5], []])
+    assert r.status_code == 200
+    assert r.json() == [3.5, 0]
+
+def test_invalid_json(client):
+    r = client("POST", "/lengths", content=b"[")
+    assert r.status_code == 422
+    assert r.json()["detail"][0]["type"] == "json_invalid"
+
+def test_non_array_body(client):
+    r = client("POST", "/lengths", json="abc")
+    assert r.status_code == 422
+    assert r.json()["detail"][0]["type"] == "list_type"
+
+def test_element_type_mismatch(client):
+    r = client("POST", "/lengths", json=["a", 1])
+    assert r.status_code == 422
+    assert r.json()["detail"][0]["loc"] == ["body", 1]
+
+def test_nested_element_type_mismatch(client):
+    r = client("POST", "/sums", json=[[1.0], ["x"]])
+    assert r.status_code == 422
+    assert r.json()["detail"][0]["loc"] == ["body", 1]
+
+def test_single_type_mismatch(client):
+    r = client("POST", "/length", json={"a": 1})
+    assert r.status_code == 422
+    assert r.json()["detail"][0]["loc"] == ["body"]
+
+def test_validation_error_matches_documented_schema(client):
+    error = client("POST", "/lengths", json=[1]).json()["detail"][0]
+    schema = client("GET", "/openapi.json").json()["components"]["schemas"]["ValidationError"]
+    assert set(schema["required"]) <= set(error)
+
+def test_bad_request_does_not_fail_shared_batch(client):
+    async def send_both():
+        return await asyncio.gather(
+            client.http_client.post("/lengths", json=[1, 2]),
+            client.http_client.post("/lengths", json=["ab"]),
+        )
+    bad, good = client.loop.run_until_complete(send_both())
+    assert bad.status_code == 422
+    assert good.status_code == 200
+    assert good.json() == [[2.0]]
+
+def test_model_error(client):
+    r = client("POST", "/fail", json=["a"])
+    assert r.status_code == 418
+    assert r.json() == "Model hiccup"
+
+def test_openapi_documents_task_routes(client):
+    paths = client("GET", "/openapi.json").json()["paths"]
+    request_schema = paths["/sums"]["post"]["requestBody"]["content"]["application/json"]["schema"]
+    assert request_schema["type"] == "array"
+    assert request_schema["items"]["items"]["type"] == "number"
+    assert "422" in paths["/lengths"]["post"]["responses"]
+
+def test_request_duration_header(client):
+    assert float(client("POST", "/lengths", json=["a"]).headers["x-request-duration"]) >= 0
+    assert float(client("GET", "/openapi.json").headers["x-request-duration"]) >= 0
+
+@pytest.mark.parametrize("request_type", [Item, List[Item], UploadFile, List[UploadFile]])
+def test_unsupported_request_type(client, request_type):
+    routes = len(client.app.router.routes)
+    with pytest.raises(Exception, match="Task routes only support"):
+        client.app.add_task_route("/unsupported", ApiModel.lengths, request_type=request_type)
+    assert len(client.app.router.routes) == routes
+
+def test_middleware_accepts_tuple_headers():
+    messages = []
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": ((b"content-type", b"text/plain"),)})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(RequestDurationMiddleware(app)({"type": "http"}, None, send))
+    headers = dict(messages[0]["headers"])
+    assert headers[b"content-type"] == b"text/plain"
+    assert b"x-request-duration" in headers
@@ -0,0 +1,73 @@
+import pytest
+
+import lib.process_functions as process_functions
+from lib.model import InferenceModel
+from lib.process_functions import worker_model_predict
+
+class FusedModel(InferenceModel):
+    @InferenceModel.task()
+    def encode(self, texts):
+        return [f"<{text}>" for text in texts]
+
+    @InferenceModel.task(group="encode", transform=lambda text: "passage: " + text)
+    def passage(self, texts):
+        ...
+
+    @InferenceModel.task(group="encode", transform=lambda text: "query: " + text)
+    def query(self, texts):
+        ...
+
+    @InferenceModel.task(group="encode")
+    def plain(self, texts):
+        ...
+
+class UnknownGroupModel(InferenceModel):
+    @InferenceModel.task(group="missing")
+    def passage(self, texts):
+        ...
+
+class ChainedGroupModel(InferenceModel):
+    @InferenceModel.task()
+    def encode(self, texts):
+        return texts
+
+    @InferenceModel.task(group="encode")
+    def passage(self, texts):
+        ...
+
+    @InferenceModel.task(group="passage")
+    def query(self, texts):
+        ...
+
+def test_task_groups():
+    assert FusedModel.get_task_groups() == {"encode": "encode", "passage": "encode", "query": "encode", "plain": "encode"}
+
+def test_unknown_group_raises():
+    with pytest.raises(Exception, match="unknown task 'missing'"):
+        UnknownGroupModel.get_task_groups()
+
+def test_chained_group_raises():
+    with pytest.raises(Exception, match="itself fused"):
+        ChainedGroupModel.get_task_groups()
+
+def test_transform_without_group_raises():
+    with pytest.raises(Exception, match="requires a group"):
+        class TransformOnlyModel(InferenceModel):
+            @InferenceModel.task(transform=lambda text: text)
+            def passage(self, texts):
+                ...
+
+def test_run_fused_task_keeps_order():
+    model = FusedModel()
+    result = model.run_fused_task("encode", ["passage", "query", "encode", "plain", "query"], ["a", "b", "c", "d", "e"])
+    assert result == ["<passage: a>", "<query: b>", "<c>", "<d>", "<query: e>"]
+
+def test_worker_model_predict_with_and_without_task_names():
+    process_functions.model = FusedModel()
+    fused = worker_model_predict("encode", ["a", "b"], ["passage", "query"])
+    assert fused.error is None
+    assert fused.result == ["<passage: a>", "<query: b>"]
+
+    plain = worker_model_predict("encode", ["a", "b"])
+    assert plain.error is None
+    assert plain.result == ["<a>", "<b>"]
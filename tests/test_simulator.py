@@ -0,0 +1,67 @@
+from dataclasses import replace
+
+import pytest
+
+from lib.settings import BaseSettings
+from lib.recorder import TrafficRecorder, TrafficRecord
+from lib.simulator import CostCurve, Simulator
+
+def test_recorder_round_trip(tmp_path):
+    path = tmp_path / "traffic.tsv"
+    recorder = TrafficRecorder(str(path))
+    recorder.record("passage", 3)
+    recorder.record("query", 1)
+    recorder.close()
+
+    records = TrafficRecorder.load(str(path))
+    assert [(x.task_name, x.size) for x in records] == [("passage", 3), ("query", 1)]
+    assert records[0].timestamp <= records[1].timestamp
+
+def test_recorder_writes_lines_before_close(tmp_path):
+    path = tmp_path / "traffic.tsv"
+    recorder = TrafficRecorder(str(path))
+    recorder.record("passage", 2)
+    assert path.read_text().endswith("\tpassage\t2\n")
+    recorder.close()
+
+def test_cost_curve_interpolates_and_extrapolates():
+    curve = CostCurve([(8, 60), (1, 20), (32, 180)])
+    assert curve.latency(1) == 20
+    assert curve.latency(4) == pytest.approx(20 + 40 * 3 / 7)
+    assert curve.latency(20) == pytest.approx(120)
+    assert curve.latency(64) == pytest.approx(340)
+    assert curve.latency(0) == pytest.approx(20 - 40 / 7)
+    assert CostCurve([(1, 10), (2, 100)]).latency(0) == 0
+    assert CostCurve([(4, 10)]).latency(100) == 10
+
+def test_cost_curve_requires_points():
+    with pytest.raises(ValueError):
+        CostCurve([])
+
+def test_single_arrival_waits_for_window_and_cost():
+    settings = replace(BaseSettings(), MAX_BATCH_WAIT_TIME=5)
+    result = Simulator({"encode": CostCurve([(1, 10)])}, settings).run([TrafficRecord(0.0, "encode", 1)])
+    assert result.batches == 1
+    assert result.latencies == [pytest.approx(15.0)]
+
+def test_task_groups_share_batches():
+    settings = replace(BaseSettings(), MAX_BATCH_WAIT_TIME=5, MAX_BATCH_SIZE=8)
+    traffic = [TrafficRecord(0.0, "passage", 2), TrafficRecord(0.001, "query", 2)]
+    cost_curves = {"passage": CostCurve([(1, 10)]), "query": CostCurve([(1, 10)]), "encode": CostCurve([(1, 10)])}
+
+    separate = Simulator(cost_curves, settings).run(traffic)
+    fused = Simulator(cost_curves, settings, task_groups={"passage": "encode", "query": "encode"}).run(traffic)
+    assert separate.batches == 2
+    assert fused.batches == 1
+    assert fused.mean_batch_size == 4
+
+def test_missing_cost_curve_for_group():
+    with pytest.raises(ValueError):
+        Simulator({"passage": CostCurve([(1, 10)])}, BaseSettings(), task_groups={"passage": "encode"}).run([TrafficRecord(0.0, "passage", 1)])
+
+def test_held_back_batches_without_wait_time_finish():
+    settings = replace(BaseSettings(), MAX_BATCH_WAIT_TIME=0, MAX_BATCH_SIZE=8, FILL_QUEUE_SIZE_THRESHOLD=0)
+    traffic = [TrafficRecord(timestamp=i / 1000, task_name="encode", size=1) for i in range(50)]
+    result = Simulator({"encode": CostCurve([(1, 10), (8, 20)])}, settings).run(traffic)
+    assert result.requests == 50
+    assert all(latency > 0 for latency in result.latencies)